@@ -414,6 +414,21 @@ def __ml(
     return estimator
 
 
+def __split_numeric(data: DataFrame) -> tuple:
+    """데이터프레임을 숫자 타입 필드와 그 밖의 필드로 분리한다.
+    bool 타입과 timedelta 타입은 숫자 타입으로 보지 않는다.
+
+    Args:
+        data (DataFrame): 데이터프레임 객체
+
+    Returns:
+        tuple: (숫자 타입 데이터프레임, 명목형 데이터프레임)
+    """
+    num_df = data.select_dtypes(include="number", exclude="timedelta")
+    cat_df = data.drop(num_df.columns, axis=1)
+    return num_df, cat_df
+
+
 def get_random_state() -> int:
     """랜덤 시드를 반환한다.
 
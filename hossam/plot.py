@@ -29,7 +29,7 @@ from sklearn.tree import export_graphviz
 
 from IPython import display
 
-from .core import get_random_state, get_n_jobs
+from .core import get_random_state, get_n_jobs, __split_numeric
 from xgboost import plot_importance as xgb_plot_importance, XGBClassifier, to_graphviz
 
 try:
@@ -310,7 +310,7 @@ def my_stackplot(
 
     # plt.grid()
 
-    if str(df[xname].dtype) in ["int", "int32", "int64", "float", "float32", "float64"]:
+    if xname in __split_numeric(df[[xname]])[0].columns:
         xticks = list(df[xname].unique())
         ax.set_xticks(xticks)
         ax.set_xticklabels(xticks)
@@ -483,7 +483,7 @@ def my_countplot(
         callback (any, optional): ax객체를 전달받아 추가적인 옵션을 처리할 수 있는 콜백함수. Defaults to None.
     """
     sort = None
-    if str(df[xname].dtype) in ["int", "int32", "int64", "float", "float32", "float64"]:
+    if xname in __split_numeric(df[[xname]])[0].columns:
         if order == 1:
             sort = sorted(list(df[xname].unique()))
         else:
@@ -1906,16 +1906,11 @@ def my_distribution_by_class(
     if xnames == None:
         xnames = data.columns
 
+    num_fields = __split_numeric(data)[0].columns
+
     for i, v in enumerate(xnames):
         # 종속변수이거나 숫자형이 아닌 경우는 제외
-        if v == hue or data[v].dtype not in [
-            "int",
-            "int32",
-            "int64",
-            "float",
-            "float32",
-            "float64",
-        ]:
+        if v == hue or v not in num_fields:
             continue
 
         if type == "kde":
@@ -1982,23 +1977,12 @@ def my_scatter_by_class(
         group = []
 
         xnames = data.columns
+        num_fields = __split_numeric(data)[0].columns
 
         for i, v in enumerate(xnames):
             j = (i + 1) % len(xnames)
 
-            if (
-                v == hue
-                or xnames[j] == hue
-                or data[v].dtype
-                not in [
-                    "int",
-                    "int32",
-                    "int64",
-                    "float",
-                    "float32",
-                    "float64",
-                ]
-            ):
+            if v == hue or xnames[j] == hue or v not in num_fields:
                 continue
 
             group.append([v, xnames[j]])
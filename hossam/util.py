@@ -1,24 +1,41 @@
 import numpy as np
 from tabulate import tabulate
-from pandas import DataFrame, Series, read_excel, get_dummies, DatetimeIndex
+from pandas import (
+    DataFrame,
+    Series,
+    read_excel,
+    get_dummies,
+    factorize,
+    concat,
+    DatetimeIndex,
+    CategoricalDtype,
+)
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, PolynomialFeatures
+from sklearn.preprocessing import StandardScaler, PolynomialFeatures
 from sklearn.impute import SimpleImputer
+from sklearn.neighbors import NearestNeighbors
 from scipy.stats import normaltest
+from scipy.sparse import csr_matrix
 
 from imblearn.over_sampling import SMOTE, RandomOverSampler
 from imblearn.under_sampling import RandomUnderSampler
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 
-import sys
+import sys, os
+from functools import lru_cache
 from pca import pca
 from matplotlib import pyplot as plt
 
 from .core import *
+from .core import __split_numeric
 
 
 def my_normalize_data(
-    mean: float, std: float, size: int = 100, round: int = 2
+    mean: float,
+    std: float,
+    size: int = 100,
+    round: int = 2,
+    random_state: int = None,
+    max_iter: int = 16,
 ) -> np.ndarray:
     """정규분포를 따르는 데이터를 생성한다.
 
@@ -26,17 +43,25 @@ def my_normalize_data(
         mean (float): 평균
         std (float): 표준편차
         size (int, optional): 데이터 크기. Defaults to 1000.
+        round (int, optional): 반올림 자리수. Defaults to 2.
+        random_state (int, optional): 난수 시드. Defaults to None.
+        max_iter (int, optional): 정규성 검정을 통과할 때까지 재생성할 최대 횟수. Defaults to 16.
 
     Returns:
         np.ndarray: 정규분포를 따르는 데이터
     """
-    p = 0
-    x = []
-    while p < 0.05:
-        x = np.random.normal(mean, std, size).round(round)
+    rng = np.random.default_rng(random_state)
+
+    for _ in range(max_iter):
+        x = rng.normal(mean, std, size).round(round)
         _, p = normaltest(x)
 
-    return x
+        if p >= 0.05:
+            return x
+
+    raise Exception(
+        f"\x1b[31m정규성을 만족하는 데이터를 생성하지 못했습니다. (max_iter={max_iter})\x1b[0m"
+    )
 
 
 def my_normalize_df(
@@ -44,6 +69,8 @@ def my_normalize_df(
     stds: list = [1, 1, 1],
     sizes: list = [100, 100, 100],
     rounds: int = 2,
+    random_state: int = None,
+    max_iter: int = 16,
 ) -> DataFrame:
     """정규분포를 따르는 데이터프레임을 생성한다.
 
@@ -52,15 +79,45 @@ def my_normalize_df(
         stds (list): 표준편차 목록
         sizes (list, optional): 데이터 크기 목록. Defaults to [100, 100, 100].
         rounds (int, optional): 반올림 자리수. Defaults to 2.
+        random_state (int, optional): 난수 시드. Defaults to None.
+        max_iter (int, optional): 정규성 검정을 통과할 때까지 재생성할 최대 횟수. Defaults to 16.
 
     Returns:
         DataFrame: 정규분포를 따르는 데이터프레임
     """
-    data = {}
-    for i in range(0, len(means)):
-        data[f"X{i+1}"] = my_normalize_data(means[i], stds[i], sizes[i], rounds)
+    rng = np.random.default_rng(random_state)
+    k = len(means)
+    columns = [f"X{i+1}" for i in range(0, k)]
+
+    # 데이터 크기가 서로 다르면 컬럼별로 생성한다. (부족한 부분은 결측치)
+    if len(set(sizes[:k])) > 1:
+        data = {}
+        for i in range(0, k):
+            data[columns[i]] = Series(
+                my_normalize_data(means[i], stds[i], sizes[i], rounds, rng, max_iter)
+            )
+
+        return DataFrame(data)
 
-    return DataFrame(data)
+    # 모든 컬럼을 한 번에 생성한 후 정규성 검정을 통과하지 못한 컬럼만 다시 생성한다.
+    means = np.asarray(means[:k], dtype="float")
+    stds = np.asarray(stds[:k], dtype="float")
+    arr = rng.normal(means, stds, size=(sizes[0], k)).round(rounds)
+
+    for _ in range(max_iter):
+        _, p = normaltest(arr, axis=0)
+        retry = p < 0.05
+
+        if not retry.any():
+            return DataFrame(arr, columns=columns)
+
+        arr[:, retry] = rng.normal(
+            means[retry], stds[retry], size=(sizes[0], retry.sum())
+        ).round(rounds)
+
+    raise Exception(
+        f"\x1b[31m정규성을 만족하는 데이터를 생성하지 못했습니다. (max_iter={max_iter})\x1b[0m"
+    )
 
 
 def my_pretty_table(data: DataFrame, headers: str = "keys") -> None:
@@ -71,6 +128,20 @@ def my_pretty_table(data: DataFrame, headers: str = "keys") -> None:
     )
 
 
+@lru_cache(maxsize=32)
+def __read_excel_cached(path: str, mtime: float, **params) -> DataFrame:
+    """엑셀 파일을 읽어들인 결과를 캐시한다. 파일이 수정되면 mtime이 달라지므로 다시 읽는다.
+
+    Args:
+        path (str): 엑셀 파일의 경로
+        mtime (float): 파일의 최종 수정 시각
+
+    Returns:
+        DataFrame: 데이터프레임 객체
+    """
+    return read_excel(path, **params)
+
+
 def my_read_excel(
     path: str,
     sheet_name: str = None,
@@ -102,7 +173,16 @@ def my_read_excel(
         params["index_col"] = index_col
 
     try:
-        data: DataFrame = read_excel(path, **params)
+        # 로컬 파일은 수정 시각과 함께 캐시하여 같은 파일을 다시 파싱하지 않는다.
+        if (
+            isinstance(path, str)
+            and os.path.isfile(path)
+            and not any(isinstance(v, list) for v in params.values())
+        ):
+            cached = __read_excel_cached(path, os.path.getmtime(path), **params)
+            data: DataFrame = cached.copy()
+        else:
+            data: DataFrame = read_excel(path, **params)
     except Exception as e:
         raise Exception(f"\x1b[31m데이터를 로드하는데 실패했습니다. ({e})\x1b[0m")
 
@@ -148,8 +228,7 @@ def my_standard_scaler(data: DataFrame, yname: str = None) -> DataFrame:
     Returns:
         DataFrame: 표준화된 데이터프레임
     """
-    # 원본 데이터 프레임 복사
-    df = data.copy()
+    df = data
 
     # 종속변수만 별도로 분리
     if yname:
@@ -157,21 +236,20 @@ def my_standard_scaler(data: DataFrame, yname: str = None) -> DataFrame:
         df = df.drop(yname, axis=1)
 
     # 카테고리 타입만 골라냄
-    category_fields = []
-    for f in df.columns:
-        if df[f].dtypes not in ["int", "int32", "int64", "float", "float32", "float64"]:
-            category_fields.append(f)
+    df, cate = __split_numeric(df)
 
-    cate = df[category_fields]
-    df = df.drop(category_fields, axis=1)
-
-    # 표준화 수행
-    scaler = StandardScaler()
-    std_df = DataFrame(scaler.fit_transform(df), index=data.index, columns=df.columns)
+    # 표준화 수행 (복사본 하나만 만들어 제자리에서 연산)
+    arr = df.to_numpy(dtype="float64", copy=True)
+    mean = np.nanmean(arr, axis=0)
+    std = np.nanstd(arr, axis=0)
+    std[std == 0] = 1
+    np.subtract(arr, mean, out=arr)
+    np.divide(arr, std, out=arr)
+    std_df = DataFrame(arr, index=data.index, columns=df.columns, copy=False)
 
     # 분리했던 명목형 변수를 다시 결합
-    if category_fields:
-        std_df[category_fields] = cate
+    if not cate.columns.empty:
+        std_df[cate.columns] = cate
 
     # 분리했던 종속 변수를 다시 결합
     if yname:
@@ -190,8 +268,7 @@ def my_minmax_scaler(data: DataFrame, yname: str = None) -> DataFrame:
     Returns:
         DataFrame: 표준화된 데이터프레임
     """
-    # 원본 데이터 프레임 복사
-    df = data.copy()
+    df = data
 
     # 종속변수만 별도로 분리
     if yname:
@@ -199,21 +276,20 @@ def my_minmax_scaler(data: DataFrame, yname: str = None) -> DataFrame:
         df = df.drop(yname, axis=1)
 
     # 카테고리 타입만 골라냄
-    category_fields = []
-    for f in df.columns:
-        if df[f].dtypes not in ["int", "int32", "int64", "float", "float32", "float64"]:
-            category_fields.append(f)
-
-    cate = df[category_fields]
-    df = df.drop(category_fields, axis=1)
+    df, cate = __split_numeric(df)
 
-    # 표준화 수행
-    scaler = MinMaxScaler()
-    std_df = DataFrame(scaler.fit_transform(df), index=data.index, columns=df.columns)
+    # 표준화 수행 (복사본 하나만 만들어 제자리에서 연산)
+    arr = df.to_numpy(dtype="float64", copy=True)
+    data_min = np.nanmin(arr, axis=0)
+    data_range = np.nanmax(arr, axis=0) - data_min
+    data_range[data_range == 0] = 1
+    np.subtract(arr, data_min, out=arr)
+    np.divide(arr, data_range, out=arr)
+    std_df = DataFrame(arr, index=data.index, columns=df.columns, copy=False)
 
     # 분리했던 명목형 변수를 다시 결합
-    if category_fields:
-        std_df[category_fields] = cate
+    if not cate.columns.empty:
+        std_df[cate.columns] = cate
 
     # 분리했던 종속 변수를 다시 결합
     if yname:
@@ -290,7 +366,8 @@ def my_category(data: DataFrame, *args: str) -> DataFrame:
     Returns:
         DataFrame: 카테고리 설정된 데이터프레임
     """
-    df = data.copy()
+    # 컬럼 단위로만 교체하므로 얕은 복사로 충분하다.
+    df = data.copy(deep=False)
 
     for k in args:
         df[k] = df[k].astype("category")
@@ -303,6 +380,7 @@ def my_unmelt(
 ) -> DataFrame:
     """두 개의 컬럼으로 구성된 데이터프레임에서 하나는 명목형, 나머지는 연속형일 경우
     명목형 변수의 값에 따라 고유한 변수를 갖는 데이터프레임으로 변환한다.
+    값의 수가 서로 다른 경우 부족한 부분은 결측치로 채워진다.
 
     Args:
         data (DataFrame): 데이터프레임
@@ -312,16 +390,34 @@ def my_unmelt(
     Returns:
         DataFrame: 변환된 데이터프레임
     """
-    result = data.groupby(id_vars)[value_vars].apply(list)
-    mydict = {}
-
-    for i in result.index:
-        mydict[i] = result[i]
+    # 명목형 변수의 값마다 몇 번째 데이터인지를 행 번호로 사용한다.
+    result = data.assign(__row__=data.groupby(id_vars).cumcount()).pivot(
+        index="__row__", columns=id_vars, values=value_vars
+    )
 
-    return DataFrame(mydict)
+    result = result.reset_index(drop=True)
+    result.columns.name = None
+    return result
 
 
 def my_replace_missing_value(data: DataFrame, strategy: str = "mean") -> DataFrame:
+    """결측치를 대체한다.
+
+    Args:
+        data (DataFrame): 데이터프레임
+        strategy (str, optional): 대체 방법 [mean, median, most_frequent, constant]. Defaults to "mean".
+
+    Returns:
+        DataFrame: 결측치가 대체된 데이터프레임
+    """
+    # 평균, 중앙값, 최빈값은 pandas에서 직접 처리
+    if strategy == "mean":
+        return data.fillna(data.mean(numeric_only=True))
+    elif strategy == "median":
+        return data.fillna(data.median(numeric_only=True))
+    elif strategy == "most_frequent":
+        return data.fillna(data.mode().iloc[0])
+
     # 결측치 처리 규칙 생성
     imr = SimpleImputer(missing_values=np.nan, strategy=strategy)
 
@@ -346,42 +442,25 @@ def my_outlier_table(data: DataFrame, *fields: str):
     if not fields:
         fields = data.columns
 
-    result = []
-    for f in fields:
-        # 숫자 타입이 아니라면 건너뜀
-        if data[f].dtypes not in [
-            "int",
-            "int32",
-            "int64",
-            "float",
-            "float32",
-            "float64",
-        ]:
-            continue
-
-        # 사분위수
-        q1 = data[f].quantile(q=0.25)
-        q2 = data[f].quantile(q=0.5)
-        q3 = data[f].quantile(q=0.75)
-
-        # 결측치 경계
-        iqr = q3 - q1
-        down = q1 - 1.5 * iqr
-        up = q3 + 1.5 * iqr
-
-        iq = {
-            "FIELD": f,
-            "Q1": q1,
-            "Q2": q2,
-            "Q3": q3,
-            "IQR": iqr,
-            "UP": up,
-            "DOWN": down,
-        }
-
-        result.append(iq)
-
-    return DataFrame(result).set_index("FIELD")
+    # 숫자 타입이 아닌 필드는 제외
+    num_df, _ = __split_numeric(data[list(fields)])
+
+    # 사분위수
+    q = num_df.quantile(q=[0.25, 0.5, 0.75])
+    q1, q2, q3 = q.iloc[0], q.iloc[1], q.iloc[2]
+
+    # 결측치 경계
+    iqr = q3 - q1
+    down = q1 - 1.5 * iqr
+    up = q3 + 1.5 * iqr
+
+    result = DataFrame(
+        {"Q1": q1, "Q2": q2, "Q3": q3, "IQR": iqr, "UP": up, "DOWN": down},
+        index=num_df.columns,
+    )
+    result.index.name = "FIELD"
+
+    return result
 
 
 def my_replace_outliner(data: DataFrame, *fields: str) -> DataFrame:
@@ -395,29 +474,24 @@ def my_replace_outliner(data: DataFrame, *fields: str) -> DataFrame:
         DataFrame: 이상치가 경계값으로 대체된 데이터 프레임
     """
 
-    # 원본 데이터 프레임 복사
-    df = data.copy()
-
     # 카테고리 타입만 골라냄
-    category_fields = []
-    for f in df.columns:
-        if df[f].dtypes not in ["int", "int32", "int64", "float", "float32", "float64"]:
-            category_fields.append(f)
-
-    cate = df[category_fields]
-    df = df.drop(category_fields, axis=1)
+    df, cate = __split_numeric(data)
 
     # 이상치 경계값을 구한다.
     outliner_table = my_outlier_table(df, *fields)
 
-    # 이상치가 발견된 필드에 대해서만 처리
-    for f in outliner_table.index:
-        df.loc[df[f] < outliner_table.loc[f, "DOWN"], f] = outliner_table.loc[f, "DOWN"]
-        df.loc[df[f] > outliner_table.loc[f, "UP"], f] = outliner_table.loc[f, "UP"]
+    # 이상치가 발견된 필드에 대해서만 처리 (대상 필드만 복사한 후 제자리에서 경계값으로 자름)
+    cols = outliner_table.index.tolist()
+    lower = outliner_table["DOWN"].to_numpy(dtype="float")[None, :]
+    upper = outliner_table["UP"].to_numpy(dtype="float")[None, :]
+    arr = df[cols].to_numpy(dtype="float", copy=True, na_value=np.nan)
+    np.maximum(arr, lower, out=arr)
+    np.minimum(arr, upper, out=arr)
+    df[cols] = arr
 
     # 분리했던 카테고리 타입을 다시 병합
-    if category_fields:
-        df[category_fields] = cate
+    if not cate.columns.empty:
+        df[cate.columns] = cate
 
     return df
 
@@ -433,29 +507,23 @@ def my_replace_outliner_to_nan(data: DataFrame, *fields: str) -> DataFrame:
         DataFrame: 이상치가 결측치로 대체된 데이터프레임
     """
 
-    # 원본 데이터 프레임 복사
-    df = data.copy()
-
-    # 카테고리 타입만 골라냄
-    category_fields = []
-    for f in df.columns:
-        if df[f].dtypes not in ["int", "int32", "int64", "float", "float32", "float64"]:
-            category_fields.append(f)
-
-    cate = df[category_fields]
-    df = df.drop(category_fields, axis=1)
+    # 카테고리 타입만 골라냄 (원본 보존을 위해 숫자 타입 필드만 복사)
+    df, cate = __split_numeric(data)
+    df = df.copy()
 
     # 이상치 경계값을 구한다.
     outliner_table = my_outlier_table(df, *fields)
 
     # 이상치가 발견된 필드에 대해서만 처리
-    for f in outliner_table.index:
-        df.loc[df[f] < outliner_table.loc[f, "DOWN"], f] = np.nan
-        df.loc[df[f] > outliner_table.loc[f, "UP"], f] = np.nan
+    cols = outliner_table.index.tolist()
+    lower = outliner_table["DOWN"].to_numpy(dtype="float")[None, :]
+    upper = outliner_table["UP"].to_numpy(dtype="float")[None, :]
+    values = df[cols].to_numpy(dtype="float", na_value=np.nan)
+    df[cols] = np.where((values < lower) | (values > upper), np.nan, values)
 
     # 분리했던 카테고리 타입을 다시 병합
-    if category_fields:
-        df[category_fields] = cate
+    if not cate.columns.empty:
+        df[cate.columns] = cate
 
     return df
 
@@ -470,17 +538,8 @@ def my_replace_outliner_to_mean(data: DataFrame, *fields: str) -> DataFrame:
     Returns:
         DataFrame: 이상치가 평균값으로 대체된 데이터프레임
     """
-    # 원본 데이터 프레임 복사
-    df = data.copy()
-
     # 카테고리 타입만 골라냄
-    category_fields = []
-    for f in df.columns:
-        if df[f].dtypes not in ["int", "int32", "int64", "float", "float32", "float64"]:
-            category_fields.append(f)
-
-    cate = df[category_fields]
-    df = df.drop(category_fields, axis=1)
+    df, cate = __split_numeric(data)
 
     # 이상치를 결측치로 대체한다.
     if not fields:
@@ -492,8 +551,8 @@ def my_replace_outliner_to_mean(data: DataFrame, *fields: str) -> DataFrame:
     df3 = my_replace_missing_value(df2, "mean")
 
     # 분리했던 카테고리 타입을 다시 병합
-    if category_fields:
-        df3[category_fields] = cate
+    if not cate.columns.empty:
+        df3[cate.columns] = cate
 
     return df3
 
@@ -513,12 +572,13 @@ def my_drop_outliner(data: DataFrame, *fields: str) -> DataFrame:
     return df.dropna()
 
 
-def my_dummies(data: DataFrame, *args: str) -> DataFrame:
+def my_dummies(data: DataFrame, *args: str, sparse: bool = False) -> DataFrame:
     """명목형 변수를 더미 변수로 변환한다.
 
     Args:
         data (DataFrame): 데이터프레임
         *args (str): 명목형 컬럼 목록
+        sparse (bool, optional): True일 경우 더미 변수를 희소 행렬(int8)로 저장한다. Defaults to False.
 
     Returns:
         DataFrame: 더미 변수로 변환된 데이터프레임
@@ -532,6 +592,31 @@ def my_dummies(data: DataFrame, *args: str) -> DataFrame:
     else:
         args = list(args)
 
+    if sparse and args:
+        # 범주의 코드로 0이 아닌 값만 저장하는 희소 행렬을 만든다. (결측치는 모두 0)
+        frames = [data.drop(args, axis=1)]
+
+        for f in args:
+            cat = data[f].astype("category")
+            codes = cat.cat.codes.to_numpy()
+
+            # 첫 번째 범주(코드 0)와 결측치(코드 -1)는 0이 아닌 값을 갖지 않는다.
+            rows = np.flatnonzero(codes > 0)
+            mat = csr_matrix(
+                (np.ones(len(rows), dtype=np.int8), (rows, codes[rows] - 1)),
+                shape=(len(data), len(cat.cat.categories) - 1),
+            )
+
+            frames.append(
+                DataFrame.sparse.from_spmatrix(
+                    mat,
+                    index=data.index,
+                    columns=[f"{f}_{c}" for c in cat.cat.categories[1:]],
+                )
+            )
+
+        return concat(frames, axis=1)
+
     return get_dummies(data, columns=args, drop_first=True, dtype="int")
 
 
@@ -550,18 +635,11 @@ def my_trend(x: any, y: any, degree=2, value_count=100) -> tuple:
     # [ a, b, c ] ==> ax^2 + bx + c
     coeff = np.polyfit(x, y, degree)
 
-    if type(x) == "list":
-        minx = min(x)
-        maxx = max(x)
-    else:
-        minx = x.min()
-        maxx = x.max()
-
-    v_trend = np.linspace(minx, maxx, value_count)
+    x = np.asarray(x)
+    v_trend = np.linspace(x.min(), x.max(), value_count)
 
-    t_trend = coeff[-1]
-    for i in range(0, degree):
-        t_trend += coeff[i] * v_trend ** (degree - i)
+    # Horner 방식으로 다항식의 값을 계산
+    t_trend = np.polyval(coeff, v_trend)
 
     return (v_trend, t_trend)
 
@@ -580,10 +658,11 @@ def my_poly_features(
     Returns:
         DataFrame: 2차항이 추가된 새로운 데이터 프레임
     """
-    df = data.copy()
+    # 컬럼 단위로만 교체하므로 얕은 복사로 충분하다.
+    df = data.copy(deep=False)
 
     if not columns:
-        columns = df.columns
+        columns = list(df.columns)
 
     if not type(columns) == list:
         columns = [columns]
@@ -595,17 +674,18 @@ def my_poly_features(
 
         ignore_df = df[ignore]
         df.drop(ignore, axis=1, inplace=True)
-
-        columns = []
-        for c in list(df.columns):
-            if c not in ignore:
-                columns.append(c)
+        columns = list(df.columns)
 
     poly = PolynomialFeatures(degree=degree, include_bias=False)
     poly_fit = poly.fit_transform(df[columns])
-    poly_df = DataFrame(poly_fit, columns=poly.get_feature_names_out(), index=df.index)
+    poly_df = DataFrame(
+        poly_fit, columns=poly.get_feature_names_out(columns), index=df.index
+    )
 
-    df[poly_df.columns] = poly_df[poly_df.columns]
+    # 원본에 이미 존재하는 1차항은 제외하고 결합
+    df = concat(
+        [df, poly_df.drop(df.columns.intersection(poly_df.columns), axis=1)], axis=1
+    )
 
     if ignore_df is not None:
         df[ignore] = ignore_df
@@ -623,21 +703,26 @@ def my_labelling(data: DataFrame, *fields: str) -> DataFrame:
     Returns:
         DataFrame: 라벨링된 데이터프레임
     """
-    df = data.copy()
+    # 컬럼 단위로만 교체하므로 얕은 복사로 충분하다.
+    df = data.copy(deep=False)
 
     for f in fields:
-        vc = sorted(list(df[f].unique()))
-        label = {v: i for i, v in enumerate(vc)}
-        df[f] = df[f].map(label).astype("int")
+        # 정렬된 고유값 순서대로 0부터 라벨을 부여한다.
+        if isinstance(df[f].dtype, CategoricalDtype):
+            # 카테고리 타입은 값 전체가 아닌 카테고리 목록만 정렬하여 코드를 변환한다.
+            cat = df[f].cat.remove_unused_categories()
+            uniques = cat.cat.categories.sort_values()
+            mapping = uniques.get_indexer(cat.cat.categories)
 
-        # 라벨링 상황을 출력한다.
-        i = []
-        v = []
-        for k in label:
-            i.append(k)
-            v.append(label[k])
+            # 결측치의 코드(-1)는 마지막에 덧붙인 -1을 가리키게 된다.
+            codes = np.append(mapping, -1)[cat.cat.codes.to_numpy()]
+        else:
+            codes, uniques = factorize(df[f], sort=True)
+
+        df[f] = codes.astype(np.int32)
 
-        label_df = DataFrame({"label": v}, index=i)
+        # 라벨링 상황을 출력한다.
+        label_df = DataFrame({"label": np.arange(len(uniques))}, index=uniques)
         label_df.index.name = f
         my_pretty_table(label_df)
 
@@ -657,7 +742,11 @@ def my_balance(xdata: DataFrame, ydata: Series, method: str = "smote") -> DataFr
     """
 
     if method == "smote":
-        smote = SMOTE(random_state=get_random_state())
+        # SMOTE의 최근접 이웃 탐색을 병렬로 수행한다. (기본 k_neighbors=5 + 자기 자신)
+        smote = SMOTE(
+            random_state=get_random_state(),
+            k_neighbors=NearestNeighbors(n_neighbors=6, n_jobs=get_n_jobs()),
+        )
         xdata, ydata = smote.fit_resample(xdata, ydata)
     elif method == "over":
         ros = RandomOverSampler(random_state=get_random_state())
@@ -673,6 +762,25 @@ def my_balance(xdata: DataFrame, ydata: Series, method: str = "smote") -> DataFr
     return xdata, ydata
 
 
+def __inv_corr(corr: np.ndarray) -> np.ndarray:
+    """상관행렬의 역행렬을 구한다.
+    완전한 공선성이 있으면 부동소수점 오차 때문에 예외 없이 잘못된 역행렬이 계산되므로,
+    항상 대각성분에 아주 작은 값을 더해 해당 변수들의 VIF가 매우 크게 계산되도록 한다.
+
+    Args:
+        corr (np.ndarray): 상관행렬
+
+    Returns:
+        np.ndarray: 역행렬
+    """
+    if not np.isfinite(corr).all():
+        raise Exception(
+            "\x1b[31m상관행렬에 유한하지 않은 값이 있어 VIF를 계산할 수 없습니다.\x1b[0m"
+        )
+
+    return np.linalg.inv(corr + np.eye(len(corr)) * 1e-10)
+
+
 def my_vif_filter(
     data: DataFrame, yname: str = None, ignore: list = [], threshold: float = 10
 ) -> DataFrame:
@@ -687,44 +795,75 @@ def my_vif_filter(
     Returns:
         DataFrame: VIF가 threshold 이하인 변수만 남은 데이터프레임
     """
-    df = data.copy()
+    df = data
 
     if yname:
         y = df[yname]
         df = df.drop(yname, axis=1)
 
     # 카테고리 타입만 골라냄
-    category_fields = []
-    for f in df.columns:
-        if df[f].dtypes not in ["int", "int32", "int64", "float", "float32", "float64"]:
-            category_fields.append(f)
-
-    cate = df[category_fields]
-    df = df.drop(category_fields, axis=1)
+    df, cate = __split_numeric(df)
 
     # 제외할 필드를 제거
     if ignore:
         ignore_df = df[ignore]
         df = df.drop(ignore, axis=1)
 
-    # VIF 계산
-    while True:
-        xnames = list(df.columns)
-        vif = {}
+    # VIF 계산 (결측치가 없는 행만 사용하고, 분산이 0인 필드는 계산에서 제외한다.)
+    values = df.dropna().to_numpy(dtype="float")
 
-        for x in xnames:
-            vif[x] = variance_inflation_factor(df, xnames.index(x))
+    if len(values) > 1:
+        varying = values.std(axis=0) > 0
+    else:
+        varying = np.zeros(len(df.columns), dtype=bool)
+
+    xnames = list(df.columns[varying])
+    dropped = []
+
+    if len(xnames) > 1:
+        # 상관행렬의 역행렬 대각성분이 각 변수의 VIF가 된다.
+        corr = np.corrcoef(values[:, varying], rowvar=False)
+
+        inv = __inv_corr(corr)
+
+        while len(xnames) > 1:
+            vif = np.diag(inv)
 
-        maxkey = max(vif, key=vif.get)
+            if np.isnan(vif).any():
+                raise Exception(
+                    "\x1b[31mVIF가 유한하지 않은 값으로 계산되었습니다.\x1b[0m"
+                )
 
-        if vif[maxkey] <= threshold:
-            break
+            # 상관행렬 역행렬의 대각성분은 항상 1 이상이므로 1보다 작다면
+            # 수치적으로 특이한 행렬로 보고 VIF를 무한대로 처리한다.
+            vif = np.where(vif < 1 - 1e-6, np.inf, vif)
+            i = int(np.argmax(vif))
 
-        df = df.drop(maxkey, axis=1)
+            if vif[i] <= threshold:
+                break
+
+            dropped.append(xnames.pop(i))
+            keep = np.arange(len(vif)) != i
+            corr = corr[keep][:, keep]
+
+            if vif[i] > 1e6:
+                # VIF가 매우 크면 갱신식의 오차가 커지므로 다시 계산한다.
+                inv = __inv_corr(corr)
+            else:
+                # i번째 변수를 제거한 역행렬을 다시 구하지 않고 갱신한다. (O(k²))
+                inv = inv[keep][:, keep] - (
+                    np.outer(inv[keep, i], inv[i, keep]) / inv[i, i]
+                )
+
+                # 갱신 결과의 대각성분이 1보다 작으면 오차가 누적된 것이므로 다시 계산한다.
+                if (np.diag(inv) < 1 - 1e-6).any():
+                    inv = __inv_corr(corr)
+
+        df = df.drop(dropped, axis=1)
 
     # 분리했던 명목형 변수를 다시 결합
-    if category_fields:
-        df[category_fields] = cate
+    if not cate.columns.empty:
+        df[cate.columns] = cate
 
     # 분리했던 제외할 필드를 다시 결합
     if ignore:
@@ -757,8 +896,12 @@ def my_pca(
     """
     if standardize:
         df = my_standard_scaler(data)
+
+        # 표준화된 값은 float32로도 충분하므로 SVD에 전달되는 데이터 크기를 절반으로 줄인다.
+        num_df, _ = __split_numeric(df)
+        df = df.astype({c: np.float32 for c in num_df.columns})
     else:
-        df = data.copy()
+        df = data
 
     model = pca(n_components=n_components, random_state=get_random_state())
     result = model.fit_transform(X=df)
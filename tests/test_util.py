@@ -0,0 +1,21 @@
+import numpy as np
+from pandas import DataFrame
+
+from hossam.util import my_vif_filter
+
+
+def test_vif_filter_drops_exact_linear_combination():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=50)
+    b = rng.normal(size=50)
+    c = rng.normal(size=50)
+    df = DataFrame({"a": a, "s": 2 * a + 1, "b": b, "ab": a + b, "c": c})
+
+    result = my_vif_filter(df)
+
+    # a와 s 중 하나, 그리고 a, b, a + b 중 하나가 제거되어야 한다.
+    assert result.shape[1] == 3
+    assert "c" in result.columns
+
+    corr = np.corrcoef(result.values, rowvar=False)
+    assert np.diag(np.linalg.inv(corr)).max() <= 10